@@ -0,0 +1,574 @@
+"""Asyncio Playwright scraper for drom.ru car listings.
+
+Collects every brand/model pair from the catalogue, walks the paginated
+listing pages of each model and dumps the parsed car items to checkpoints
+and a final CSV file.
+"""
+
+import asyncio
+import contextlib
+import datetime
+import math
+import os
+import pickle
+import re
+
+import aiohttp
+import httpx
+import orjson
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from playwright.async_api import Browser, BrowserContext, async_playwright
+from selectolax.parser import HTMLParser
+
+BASE_URL = "https://auto.drom.ru"
+ITEMS_PER_PAGE = 20
+
+HTTP_HEADERS = {
+    "user-agent": "Mozilla/5.0 (compatible; Googlebot/2.1;"
+    " +http://www.google.com/bot.html)"
+}
+
+# Substrings that mark an anti-bot interstitial instead of real listing
+# markup; such pages are retried through the browser.
+_ANTIBOT_MARKERS = (
+    "Подтвердите, что вы не робот",
+    "captcha",
+)
+
+BLOCK_RESOURCE_TYPES = [
+    "image",
+    "media",
+    "font",
+    "stylesheet",
+    "other",
+]
+BLOCK_RESOURCE_NAMES = [
+    "adfox",
+    "an.yandex",
+    "doubleclick",
+    "google-analytics",
+    "googletagmanager",
+    "mc.yandex",
+    "vk.com",
+]
+
+_BLOCK_TYPES = frozenset(BLOCK_RESOURCE_TYPES)
+_BLOCK_RE = re.compile("|".join(map(re.escape, BLOCK_RESOURCE_NAMES)))
+
+_NON_DIGIT = re.compile(r"\D+")
+_CAR_URL_RE = re.compile(
+    r"//(?P<city>[^./]+)\.drom\.ru/(?P<brand>[^/]+)/(?P<model>[^/]+)/(?P<id>\d+)"
+)
+
+# CSS selectors shared between the browser waits and the offline parsers,
+# defined once so both sides always target the same markup.
+_SEL_CAR_ITEM = "a[data-ftid='bulls-list_bull']"
+_SEL_TITLE = "span[data-ftid='bull_title']"
+_SEL_DESCRIPTION = "div[data-ftid='component_inline-bull-description']"
+_SEL_BROKEN = "div[data-ftid='bull_label_broken']"
+_SEL_NODOCS = "div[data-ftid='bull_label_nodocs']"
+_SEL_PRICE = "span[data-ftid='bull_price']"
+_SEL_PRICE_ESTIMATION = "div.css-b9bhjf.ejipaoe0"
+_SEL_LOCATION = "span[data-ftid='bull_location']"
+_SEL_DATE = "div[data-ftid='bull_date']"
+_SEL_BULLS_COUNTER = "div[data-ftid='component_bulls-counter']"
+_SEL_BRANDS_LIST = "div[data-ftid='component_brands-list']"
+_SEL_BRAND_NAME = "a[data-ftid='component_brands-list-item_name']"
+_SEL_MODELS_LIST = "div[data-ftid='component_models-list']"
+_SEL_MODEL_ITEM = "div[data-ftid='component_models-list-item']"
+_SEL_MODEL_NAME = "a[data-ftid='component_models-list-item_name']"
+_SEL_MODEL_COUNTER = "span[data-ftid='component_models-list-item_counter']"
+
+
+_MONTH_NUMBER = {
+    "января": 1,
+    "февраля": 2,
+    "марта": 3,
+    "апреля": 4,
+    "мая": 5,
+    "июня": 6,
+    "июля": 7,
+    "августа": 8,
+    "сентября": 9,
+    "октября": 10,
+    "ноября": 11,
+    "декабря": 12,
+}
+_TODAY_KEYWORDS = frozenset({"сегодня", "назад"})
+
+
+def _to_int(s: str) -> int:
+    """Parse an int out of a string with separators/units ("1 250 000 ₽")."""
+    return int(_NON_DIGIT.sub("", s))
+
+_PARAM_SPECIFICATION = {
+    "capacity": r"\d+\.\d+ л",
+    "power": r"\d+ л\.с\.",
+    "fuel": r"бензин|дизель|гибрид|электро",
+    "transmission": r"АКПП|механика|автомат|робот|вариатор",
+    "drive": r"передний|задний|4WD",
+    "mileage": r"[0-9\s]+ км",
+}
+_PARAM_KEYS = tuple(_PARAM_SPECIFICATION)
+_PARAM_RE = re.compile(
+    "|".join(f"(?P<{param}>{regex})" for param, regex in _PARAM_SPECIFICATION.items())
+)
+
+
+class ContextPool:
+    """Pool of short-lived ``BrowserContext`` objects over one shared ``Browser``.
+
+    Contexts are far cheaper to create than browsers, so the pool keeps a
+    single Chromium process alive and hands out pre-warmed contexts.  A
+    context is recycled (closed and replaced with a fresh one) after
+    ``max_uses`` acquisitions so per-context state never grows unbounded.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        size: int = 8,
+        max_uses: int = 50,
+        context_kwargs: dict = None,
+        route_handler=None,
+    ):
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.context_kwargs = context_kwargs or {}
+        self.route_handler = route_handler
+        self._contexts: asyncio.Queue = asyncio.Queue()
+        self._uses: dict = {}
+
+    async def start(self):
+        for _ in range(self.size):
+            await self._contexts.put(await self._new_context())
+
+    async def _new_context(self) -> BrowserContext:
+        context = await self.browser.new_context(**self.context_kwargs)
+        # A context-level route applies to every page opened in the context,
+        # so pages never pay their own route-registration round-trip.
+        if self.route_handler is not None:
+            await context.route("**/*", self.route_handler)
+        self._uses[context] = 0
+        return context
+
+    def acquire(self) -> "_PooledContext":
+        return _PooledContext(self)
+
+    async def close(self):
+        while self._uses:
+            context = await self._contexts.get()
+            del self._uses[context]
+            await context.close()
+
+
+class _PooledContext:
+    """Async context manager handed out by :meth:`ContextPool.acquire`."""
+
+    def __init__(self, pool: ContextPool):
+        self._pool = pool
+        self._context = None
+
+    async def __aenter__(self) -> BrowserContext:
+        self._context = await self._pool._contexts.get()
+        return self._context
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        pool = self._pool
+        pool._uses[self._context] += 1
+        if pool._uses[self._context] >= pool.max_uses:
+            del pool._uses[self._context]
+            await self._context.close()
+            self._context = await pool._new_context()
+        await pool._contexts.put(self._context)
+
+
+class DromScraper:
+    def __init__(
+        self,
+        csv_file: str = "car_items.csv",
+        chunks_size: int = 50,
+        pool_size: int = 8,
+        max_concurrent_models: int = 8,
+        checkpoint_every: int = 5,
+        page_workers: int = 8,
+        state_path: str = "state.json",
+    ):
+        self.state_path = state_path
+        self.csv_file = csv_file
+        self.chunks_size = chunks_size
+        self.pool_size = pool_size
+        self.page_workers = page_workers
+        self.max_concurrent_models = max_concurrent_models
+        self.checkpoint_every = checkpoint_every
+        self._http: aiohttp.ClientSession = None
+        self._seen_ids: set = set()
+        self._today = datetime.datetime.now().date()
+        self._today_iso = self._today.isoformat()
+        os.makedirs("global_checkpoint", exist_ok=True)
+        self._global_fp = open("global_checkpoint/car_items.ndjson", "ab")
+
+    @staticmethod
+    def load_global_checkpoint(path: str = "global_checkpoint/car_items.ndjson") -> list:
+        """Read back the append-only checkpoint: one JSON object per line."""
+        with open(path, "rb") as gchp:
+            return [orjson.loads(line) for line in gchp if line.strip()]
+
+    async def scrape(self):
+        # The listing markup is server-rendered, so most pages are fetched
+        # over plain HTTP; the browser pool only serves anti-bot fallbacks.
+        self._http = aiohttp.ClientSession(
+            headers=HTTP_HEADERS,
+            connector=aiohttp.TCPConnector(
+                limit=64, limit_per_host=16, ttl_dns_cache=600
+            ),
+        )
+        try:
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+                # Reusing cookies/local storage from the previous run skips
+                # Drom's anti-bot warm-up on the first navigations.
+                context_kwargs = {}
+                if os.path.exists(self.state_path):
+                    context_kwargs["storage_state"] = self.state_path
+                pool = ContextPool(
+                    browser,
+                    size=self.pool_size,
+                    context_kwargs=context_kwargs,
+                    route_handler=self._intercept_route,
+                )
+                await pool.start()
+                models_items = await self.get_model_items(pool)
+                car_items = await self.get_car_items(pool, models_items)
+                async with pool.acquire() as context:
+                    await context.storage_state(path=self.state_path)
+                await pool.close()
+                await browser.close()
+        finally:
+            await self._http.close()
+            self._http = None
+        # The Arrow CSV writer is multi-threaded C++ and avoids pandas'
+        # row-by-row serialization.
+        table = pa.Table.from_pylist(car_items)
+        pacsv.write_csv(table, self.csv_file)
+
+    async def get_model_items(self, pool: ContextPool) -> list:
+        async with pool.acquire() as context:
+            page = await context.new_page()
+            await page.goto(BASE_URL)
+            await page.wait_for_selector(_SEL_BRANDS_LIST)
+            brands_links = await page.query_selector_all(
+                _SEL_BRAND_NAME
+            )
+            brands_urls = [await link.get_attribute("href") for link in brands_links]
+            await page.close()
+        # Stream results as they finish instead of gathering fixed chunks:
+        # fast pages are consumed immediately and never wait for the slowest
+        # member of their chunk.
+        semaphore = asyncio.Semaphore(self.chunks_size)
+
+        async def bounded_parse(brand_url: str) -> list:
+            async with semaphore:
+                return await self.parse_group_by_models_page(pool, brand_url)
+
+        models_items = []
+        for completed in asyncio.as_completed(
+            [bounded_parse(url) for url in brands_urls]
+        ):
+            models_items.extend(await completed)
+        return models_items
+
+    async def get_car_items(self, pool: ContextPool, models_items: list) -> list:
+        os.makedirs("model_checkpoints", exist_ok=True)
+        car_items = []
+        semaphore = asyncio.Semaphore(self.max_concurrent_models)
+        results_queue: asyncio.Queue = asyncio.Queue()
+
+        async def scrape_model(model_item: dict):
+            async with semaphore:
+                model_car_items = await self.get_model_car_items(pool, model_item)
+            await results_queue.put((model_item, model_car_items))
+
+        async def write_checkpoints():
+            # Single writer coroutine: checkpoint files are never touched
+            # from two tasks at once.  The global checkpoint is an append-only
+            # NDJSON stream, so each completion costs O(model) bytes instead
+            # of rewriting the whole accumulated list.
+            for completed in range(1, len(models_items) + 1):
+                model_item, model_car_items = await results_queue.get()
+                car_items.extend(model_car_items)
+                checkpoint_file = (
+                    f"model_checkpoints/{model_item['brand']}_{model_item['model']}.pkl"
+                )
+                with open(checkpoint_file, "wb") as chp:
+                    pickle.dump(model_car_items, chp, pickle.HIGHEST_PROTOCOL)
+                for car_item in model_car_items:
+                    self._global_fp.write(orjson.dumps(car_item) + b"\n")
+                if (
+                    completed % self.checkpoint_every == 0
+                    or completed == len(models_items)
+                ):
+                    self._global_fp.flush()
+
+        await asyncio.gather(
+            write_checkpoints(),
+            *(scrape_model(model_item) for model_item in models_items),
+        )
+        return car_items
+
+    async def get_model_car_items(self, pool: ContextPool, model_item: dict) -> list:
+        return await self.parse_model_page(pool, model_item["url"])
+
+    async def parse_model_page(self, pool: ContextPool, url: str) -> list:
+        model_car_items, pages_number = await self.parse_model_first_page(pool, url)
+        url_queue: asyncio.Queue = asyncio.Queue()
+        for page_number in range(2, pages_number + 1):
+            url_queue.put_nowait(f"{url}page{page_number}/")
+        workers = [
+            self._listing_worker(pool, url_queue, model_car_items)
+            for _ in range(min(self.page_workers, url_queue.qsize()))
+        ]
+        if workers:
+            await asyncio.gather(*workers)
+        return model_car_items
+
+    async def _listing_worker(
+        self, pool: ContextPool, url_queue: asyncio.Queue, model_car_items: list
+    ):
+        """Drain listing URLs from the queue, reusing one long-lived browser
+        page (created on the first anti-bot fallback) for every render
+        instead of paying new_page() + route() per URL."""
+        async with contextlib.AsyncExitStack() as stack:
+            page = None
+            while True:
+                try:
+                    url = url_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                html = await self._fetch_static(url)
+                if html is None:
+                    if page is None:
+                        context = await stack.enter_async_context(pool.acquire())
+                        page = await context.new_page()
+                    await page.goto(url)
+                    await page.wait_for_selector(_SEL_CAR_ITEM)
+                    html = await page.content()
+                model_car_items.extend(self._parse_listing_html(html))
+            if page is not None:
+                await page.close()
+
+    async def parse_model_first_page(self, pool: ContextPool, url: str) -> tuple:
+        """Load page 1 once, returning both its car items and the total
+        number of listing pages, so the page is never fetched twice."""
+        html = await self._fetch_static(url)
+        if html is None:
+            html = await self._render_page(pool, url, _SEL_CAR_ITEM)
+        counter = HTMLParser(html).css_first(_SEL_BULLS_COUNTER)
+        items_number = _to_int(counter.text())
+        pages_number = math.ceil(items_number / ITEMS_PER_PAGE)
+        return self._parse_listing_html(html), pages_number
+
+    async def _fetch_static(self, url: str) -> str:
+        """Fetch a page over plain HTTP; ``None`` means it needs the browser."""
+        if self._http is None:
+            return None
+        try:
+            async with self._http.get(url) as response:
+                if response.status != 200:
+                    return None
+                html = await response.text()
+        except aiohttp.ClientError:
+            return None
+        if any(marker in html for marker in _ANTIBOT_MARKERS):
+            return None
+        return html
+
+    async def _render_page(self, pool: ContextPool, url: str, wait_selector: str) -> str:
+        async with pool.acquire() as context:
+            page = await context.new_page()
+            await page.goto(url)
+            await page.wait_for_selector(wait_selector)
+            # One content() round-trip instead of ~11 CDP calls per car item;
+            # the actual parsing happens offline in C via selectolax.
+            html = await page.content()
+            await page.close()
+        return html
+
+    def _parse_listing_html(self, html: str) -> list:
+        tree = HTMLParser(html)
+        parsed_car_items = []
+        for node in tree.css(_SEL_CAR_ITEM):
+            car_url = node.attributes.get("href")
+            title = node.css_first(_SEL_TITLE).text()
+            desription_node = node.css_first(
+                _SEL_DESCRIPTION
+            )
+            item_desription = desription_node.text() if desription_node else ""
+            broken = node.css_first(_SEL_BROKEN) is not None
+            nodocs = node.css_first(_SEL_NODOCS) is not None
+            price = _to_int(node.css_first(_SEL_PRICE).text())
+            price_estimation_node = node.css_first(_SEL_PRICE_ESTIMATION)
+            price_estimation = (
+                price_estimation_node.text() if price_estimation_node else None
+            )
+            city = node.css_first(_SEL_LOCATION).text()
+            date = self._get_date_from_car_item_date(
+                node.css_first(_SEL_DATE).text()
+            )
+            photo_node = node.css_first("img")
+            photo = photo_node.attributes.get("src") if photo_node else None
+            city_from_url, brand, model, car_id = self._parse_car_url(car_url)
+            desription_params = self._parse_car_item_desription(item_desription)
+            parsed_car_items.append(
+                {
+                    "id": car_id,
+                    "brand": brand,
+                    "model": model,
+                    "url": car_url,
+                    "title": title,
+                    "year": int(title.split()[-1]),
+                    **desription_params,
+                    "broken": broken,
+                    "nodocs": nodocs,
+                    "price": price,
+                    "price_estimation": price_estimation,
+                    "city": city,
+                    "date": date,
+                    "photo": photo,
+                }
+            )
+        # Pagination drift makes the same ad show up on two pages; drop
+        # repeats before they hit the description regex, checkpoints and DB.
+        parsed_car_items = [
+            car_item
+            for car_item in parsed_car_items
+            if car_item["id"] not in self._seen_ids
+        ]
+        self._seen_ids.update(car_item["id"] for car_item in parsed_car_items)
+        return parsed_car_items
+
+    async def parse_group_by_models_page(self, pool: ContextPool, url: str) -> list:
+        html = await self._fetch_static(url)
+        if html is None:
+            html = await self._render_page(
+                pool, url, _SEL_MODELS_LIST
+            )
+        return self._parse_models_html(html)
+
+    def _parse_models_html(self, html: str) -> list:
+        tree = HTMLParser(html)
+        models_items = []
+        for node in tree.css(_SEL_MODEL_ITEM):
+            link = node.css_first(_SEL_MODEL_NAME)
+            model_url = link.attributes.get("href")
+            counter = node.css_first(
+                _SEL_MODEL_COUNTER
+            )
+            ads_number = _to_int(counter.text()) if counter else 0
+            splited_model_url = model_url.rstrip("/").split("/")
+            models_items.append(
+                {
+                    "brand": splited_model_url[-2],
+                    "model": splited_model_url[-1],
+                    "url": model_url,
+                    "ads_number": ads_number,
+                }
+            )
+        return models_items
+
+    async def _intercept_route(self, route):
+        # Called for every request the browser makes, so keep it to one set
+        # lookup and one compiled-regex scan.
+        if route.request.resource_type in _BLOCK_TYPES or _BLOCK_RE.search(
+            route.request.url
+        ):
+            return await route.abort()
+        return await route.continue_()
+
+    @staticmethod
+    def _parse_car_url(car_url: str) -> tuple:
+        mo = _CAR_URL_RE.search(car_url)
+        return mo["city"], mo["brand"], mo["model"], mo["id"]
+
+    @staticmethod
+    def _parse_car_item_desription(item_desription: str) -> dict:
+        param_dict = dict.fromkeys(_PARAM_KEYS)
+        for mo in _PARAM_RE.finditer(item_desription):
+            param = mo.lastgroup
+            value = mo.group()
+            if param == "capacity":
+                param_dict[param] = float(value.split()[0])
+            elif param in ("power", "mileage"):
+                param_dict[param] = _to_int(value)
+            else:
+                param_dict[param] = value
+        return param_dict
+
+    def _get_date_from_car_item_date(self, car_item_date: str) -> str:
+        splited_car_item_date = car_item_date.split()
+        if not _TODAY_KEYWORDS.isdisjoint(splited_car_item_date):
+            return self._today_iso
+        day = int(splited_car_item_date[0])
+        month = _MONTH_NUMBER[splited_car_item_date[1]]
+        parsed_date = datetime.date(self._today.year, month, day)
+        if parsed_date > self._today:
+            parsed_date = datetime.date(self._today.year - 1, month, day)
+        return parsed_date.isoformat()
+
+
+class SimpleDromScraper:
+    """Lightweight HTTP scraper for pages that do not need a browser."""
+
+    def __init__(self, headers: dict = None):
+        # The condition used to be inverted: runs without explicit headers
+        # were sent with headers=None, which trips Drom's anti-bot path.
+        self.headers = (
+            headers
+            if headers is not None
+            else {
+                "user-agent": "Mozilla/5.0 (compatible; Googlebot/2.1;"
+                " +http://www.google.com/bot.html)"
+            }
+        )
+        self.client: httpx.AsyncClient = None
+
+    async def start(self):
+        """Create the long-lived HTTP/2 client; call once from the driver."""
+        # HTTP/2 multiplexes all requests over a few keep-alive connections,
+        # so no per-request TCP+TLS handshake is paid.
+        self.client = httpx.AsyncClient(
+            http2=True,
+            http1=False,
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30.0,
+        )
+
+    async def stop(self):
+        await self.client.aclose()
+        self.client = None
+
+    async def fetch(self, url: str) -> str:
+        response = await self.client.get(url)
+        return response.text
+
+    async def main(self, urls: list) -> list:
+        owns_client = self.client is None
+        if owns_client:
+            await self.start()
+        try:
+            return await asyncio.gather(*(self.fetch(url) for url in urls))
+        finally:
+            if owns_client:
+                await self.stop()
+
+
+def main():
+    scraper = DromScraper()
+    asyncio.run(scraper.scrape())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import msgspec
+from scrapy.exporters import BaseItemExporter
+
+
+class MsgspecLinesExporter(BaseItemExporter):
+    """JSON-lines exporter encoding items with msgspec.
+
+    CarItem is a msgspec.Struct, so encoding skips dict introspection
+    entirely and runs in C instead of the stdlib json used by Scrapy's
+    default exporters.
+    """
+
+    def __init__(self, file, **kwargs):
+        super().__init__(dont_fail=True, **kwargs)
+        self.file = file
+
+    def export_item(self, item):
+        self.file.write(msgspec.json.encode(item) + b"\n")
@@ -0,0 +1,28 @@
+from sqlalchemy import BigInteger, Boolean, Column, Date, Float, Integer, String
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+
+
+class Car(Base):
+    __tablename__ = "cars"
+
+    id = Column(BigInteger, primary_key=True)
+    brand = Column(String)
+    model = Column(String)
+    url = Column(String)
+    title = Column(String)
+    year = Column(Integer)
+    capacity = Column(Float)
+    power = Column(Integer)
+    fuel = Column(String)
+    transmission = Column(String)
+    drive = Column(String)
+    mileage = Column(BigInteger)
+    broken = Column(Boolean)
+    nodocs = Column(Boolean)
+    price = Column(BigInteger)
+    price_estimation = Column(String)
+    city = Column(String)
+    date = Column(Date)
+    photo = Column(String)
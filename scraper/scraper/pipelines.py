@@ -0,0 +1,56 @@
+import logging
+
+import msgspec
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import sessionmaker
+
+from scraper import settings
+from scraper.models import Base, Car
+
+
+class SQLAlchemyPipeline:
+    """Persist scraped car items into PostgreSQL in batches."""
+
+    batch_size = 500
+
+    def open_spider(self, spider):
+        self.engine = create_engine(
+            settings.DATABASE_URL,
+            pool_pre_ping=True,
+            pool_size=8,
+            executemany_mode="values_plus_batch",
+        )
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+        self.session = self.Session()
+        self.buffer = []
+
+    def process_item(self, item, spider):
+        self.buffer.append(msgspec.structs.asdict(item))
+        if len(self.buffer) >= self.batch_size:
+            self._flush()
+        return item
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        # Re-scraped ads are expected; let PostgreSQL skip them instead of
+        # failing the whole batch on the primary-key constraint.
+        stmt = (
+            insert(Car)
+            .values(self.buffer)
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+        try:
+            self.session.execute(stmt)
+            self.session.commit()
+            logging.info(f"Inserted batch of {len(self.buffer)} items")
+        except Exception as error:
+            self.session.rollback()
+            logging.error(f"Failed to insert batch: {error}")
+        self.buffer.clear()
+
+    def close_spider(self, spider):
+        self._flush()
+        self.session.close()
@@ -0,0 +1,190 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import scrapy
+from lxml.etree import XPath
+from scrapy_playwright.page import PageMethod
+
+from scraper.items import CarItem
+from scraper.utils import (
+    digits_int,
+    get_date_from_car_item_date,
+    get_year_intervals,
+    parse_car_item_desription,
+    parse_car_url,
+)
+
+MIN_YEAR = 1990
+MAX_YEAR = 2024
+MAX_ADS_PER_QUERY = 2000
+
+
+def _first(results):
+    return results[0] if results else None
+
+
+# The selector set is fixed for this spider; _extract_card compiles it once
+# per worker thread, so the per-card loop is raw C XPath evaluation plus
+# casts, with no Python-level dispatch.
+_EXTRACTOR_QUERIES = {
+    "url": "./@href",
+    "title": ".//div[@data-ftid='bull_title']/text()",
+    # string() concatenates the span texts inside libxml2, returning one
+    # ready-made str instead of a list to re-join in Python.
+    "description": "string(.//div[@data-ftid='component_inline-bull-description'])",
+    # Both rarity labels as one numeric bitmask (bit 0 broken, bit 1
+    # nodocs): count() is computed inside libxml2, so no node list ever
+    # crosses into Python.
+    "labels": (
+        "count(.//div[@data-ftid='bull_label_broken'])"
+        " + 2 * count(.//div[@data-ftid='bull_label_nodocs'])"
+    ),
+    "price": ".//span[@data-ftid='bull_price']/text()",
+    "price_estimation": ".//div[contains(@class, 'css-b9bhjf')]/text()",
+    "city": ".//span[@data-ftid='bull_location']/text()",
+    "date": ".//div[@data-ftid='bull_date']/text()",
+    "photo": ".//img/@src",
+}
+
+# Compiled XPath evaluators are not thread-safe: each guards its evaluation
+# context with a lock, so sharing them across the pool would serialize the
+# workers on that lock. Every thread compiles its own set on first use.
+_thread_extractors = threading.local()
+
+
+def _extract_card(node):
+    """Pure extraction: raw lxml card node -> dict of raw XPath results."""
+    try:
+        extractors = _thread_extractors.compiled
+    except AttributeError:
+        extractors = _thread_extractors.compiled = {
+            key: XPath(query) for key, query in _EXTRACTOR_QUERIES.items()
+        }
+    return {key: xp(node) for key, xp in extractors.items()}
+
+
+class DromSpider(scrapy.Spider):
+    name = "drom"
+
+    # The card container query runs once per page, so a class-scope string
+    # (compiled and cached by parsel) is enough; everything inside a card
+    # goes through _extract_card.
+    _XP_CARS = "//a[@data-ftid='bulls-list_bull']"
+
+    # libxml2 releases the GIL while evaluating XPath, and _extract_card
+    # touches no spider state, so a page's cards extract in parallel.
+    _extract_pool = ThreadPoolExecutor(max_workers=4)
+
+    def start_requests(self):
+        yield scrapy.Request(
+            "https://auto.drom.ru/",
+            callback=self.parse,
+            meta={
+                "playwright": True,
+                "playwright_context": "default",
+                "playwright_page_goto_kwargs": {"wait_until": "domcontentloaded"},
+                "playwright_page_methods": [
+                    PageMethod(
+                        "wait_for_selector",
+                        "div[data-ftid='component_models-list']",
+                        state="attached",
+                        timeout=5000,
+                    )
+                ],
+            },
+        )
+
+    async def parse(self, response):
+        for model in response.xpath("//div[@data-ftid='component_models-list-item']"):
+            model_url = model.xpath(
+                ".//a[@data-ftid='component_models-list-item_name']/@href"
+            ).get()
+            counter = model.xpath(
+                ".//span[@data-ftid='component_models-list-item_counter']/text()"
+            ).get()
+            ads_number = digits_int(counter) if counter else 0
+            if ads_number > MAX_ADS_PER_QUERY:
+                # Drom only exposes the first 2000 ads of a query, so big
+                # models have to be split into year intervals.
+                for min_year, max_year in get_year_intervals(MIN_YEAR, MAX_YEAR):
+                    yield scrapy.Request(
+                        f"{model_url}?minyear={min_year}&maxyear={max_year}",
+                        callback=self.parse_model,
+                        meta=self._listing_meta(),
+                    )
+            else:
+                yield scrapy.Request(
+                    model_url, callback=self.parse_model, meta=self._listing_meta()
+                )
+
+    def _listing_meta(self):
+        # domcontentloaded + an "attached" selector wait detects usable
+        # markup as soon as it exists instead of waiting for the full load
+        # event with Playwright's 30s default timeout.
+        return {
+            "playwright": True,
+            "playwright_context": "default",
+            "playwright_page_goto_kwargs": {"wait_until": "domcontentloaded"},
+            "playwright_page_methods": [
+                PageMethod(
+                    "wait_for_selector",
+                    "a[data-ftid='bulls-list_bull']",
+                    state="attached",
+                    timeout=5000,
+                )
+            ],
+        }
+
+    async def parse_model(self, response):
+        roots = [car.root for car in response.xpath(self._XP_CARS)]
+        for raw in self._extract_pool.map(_extract_card, roots):
+            url = raw["url"][0]
+            title = raw["title"][0]
+            # Slice from rfind instead of split(): no throwaway word list.
+            year = int(title[title.rfind(" ") + 1 :])
+            # One tuple unpack instead of six dict lookups.
+            capacity, power, fuel, transmission, drive, mileage = (
+                parse_car_item_desription(raw["description"])
+            )
+            labels = int(raw["labels"])
+            broken = bool(labels & 1)
+            nodocs = bool(labels & 2)
+            price = digits_int(raw["price"][0])
+            price_estimation = _first(raw["price_estimation"])
+            city = _first(raw["city"])
+            date = get_date_from_car_item_date(raw["date"][0])
+            photo = _first(raw["photo"])
+            city_from_url, brand, model, car_id = parse_car_url(url)
+            yield CarItem(
+                id=int(car_id),
+                brand=brand,
+                model=model,
+                url=url,
+                title=title,
+                year=year,
+                capacity=capacity,
+                power=power,
+                fuel=fuel,
+                transmission=transmission,
+                drive=drive,
+                mileage=mileage,
+                broken=broken,
+                nodocs=nodocs,
+                price=price,
+                price_estimation=price_estimation,
+                city=city,
+                date=date,
+                photo=photo,
+            )
+        next_page = response.xpath(
+            "//a[@data-ftid='component_pagination-item-next']/@href"
+        ).get()
+        if next_page:
+            yield scrapy.Request(
+                response.urljoin(next_page),
+                callback=self.parse_model,
+                meta=self._listing_meta(),
+            )
+
+    def closed(self, reason):
+        self._extract_pool.shutdown(wait=False)
@@ -0,0 +1,131 @@
+import datetime
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Units are matched with lookaheads so each group captures the bare value;
+# mileage deliberately avoids \s so the class cannot backtrack across the
+# newlines/separators between description fields.
+_PARAM_SPEC = {
+    "capacity": r"\d+\.\d+(?=\s+л)",
+    "power": r"\d+(?=\s+л\.с\.)",
+    "fuel": r"бензин|дизель|гибрид|электро",
+    "transmission": r"АКПП|механика|автомат|робот|вариатор",
+    "drive": r"передний|задний|4WD",
+    "mileage": r"\d[\d \u00A0]*(?=\s+км)",
+}
+_PARAMS_RE = re.compile(
+    "|".join(f"(?P<{param}>{regex})" for param, regex in _PARAM_SPEC.items())
+)
+_DIGITS_RE = re.compile(r"\d+")
+_CAR_URL_RE = re.compile(
+    r"//(?P<city>[^./]+)\.drom\.ru/(?P<brand>[^/]+)/(?P<model>[^/]+)/(?P<id>\d+)"
+)
+
+
+def digits_int(s):
+    """Parse an int out of a string with separators/units ("1 250 000 ₽")."""
+    return int("".join(_DIGITS_RE.findall(s)))
+
+
+@lru_cache(maxsize=4096)
+def parse_car_url(car_url):
+    """Extract (city, brand, model, id) from a car ad URL.
+
+    The same URL shows up again on paginated crawls and retries, so hits
+    are served from the cache without re-scanning the string.
+    """
+    mo = _CAR_URL_RE.search(car_url)
+    return mo["city"], mo["brand"], mo["model"], mo["id"]
+
+
+# Per-parameter cast, looked up once per match instead of walking an
+# if/elif chain of string compares.
+_CASTERS = {
+    "capacity": float,
+    "power": int,
+    "mileage": digits_int,
+    "fuel": str,
+    "transmission": str,
+    "drive": str,
+}
+
+
+class CarDescParams(NamedTuple):
+    """Parsed description fields, unpackable in declaration order."""
+
+    capacity: Optional[float]
+    power: Optional[int]
+    fuel: Optional[str]
+    transmission: Optional[str]
+    drive: Optional[str]
+    mileage: Optional[int]
+
+
+def parse_car_item_desription(item_desription):
+    """Parse the inline description of a car ad into a CarDescParams."""
+    param_dict = dict.fromkeys(_PARAM_SPEC)
+    casters = _CASTERS
+    for mo in _PARAMS_RE.finditer(item_desription):
+        param = mo.lastgroup
+        param_dict[param] = casters[param](mo.group())
+    return CarDescParams(**param_dict)
+
+
+_MONTHS = {
+    "января": 1,
+    "февраля": 2,
+    "марта": 3,
+    "апреля": 4,
+    "мая": 5,
+    "июня": 6,
+    "июля": 7,
+    "августа": 8,
+    "сентября": 9,
+    "октября": 10,
+    "ноября": 11,
+    "декабря": 12,
+}
+_TODAY_KW = frozenset({"сегодня", "назад"})
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(raw, today_ordinal):
+    today = datetime.date.fromordinal(today_ordinal)
+    # partition() returns a 3-tuple instead of split()'s word list.
+    # "сегодня" is always the first word and "назад" the last
+    # ("5 минут назад"); otherwise the format is "<day> <month>".
+    first_word, _, rest = raw.partition(" ")
+    if first_word == "сегодня" or raw.rpartition(" ")[2] == "назад":
+        return today.isoformat()
+    day = int(first_word)
+    month = _MONTHS[rest.partition(" ")[0]]
+    parsed_date = datetime.date(today.year, month, day)
+    if parsed_date > today:
+        parsed_date = datetime.date(today.year - 1, month, day)
+    return parsed_date.isoformat()
+
+
+def get_date_from_car_item_date(car_item_date):
+    """Turn a human-readable ad date ("сегодня", "5 минут назад",
+    "12 декабря") into an ISO date string.
+
+    Date strings repeat heavily within a listing page, so the real work is
+    memoized; today's ordinal is part of the key to keep long-running
+    crawls correct across midnight.
+    """
+    return _parse_date(car_item_date, datetime.date.today().toordinal())
+
+
+@lru_cache(maxsize=None)
+def get_year_intervals(min_year, max_year, step=3):
+    """Split [min_year, max_year] into consecutive closed intervals.
+
+    Pure function over a tiny input domain, so results are cached; the
+    return value is an immutable tuple that is safe to share between
+    callers.
+    """
+    return tuple(
+        (year, min(year + step - 1, max_year))
+        for year in range(min_year, max_year + 1, step)
+    )